@@ -4,20 +4,132 @@ Provides interface for managing notices, users, and viewing statistics.
 """
 
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-import plotly.express as px
-import plotly.graph_objects as go
+from datetime import datetime
 import db
 import auth
-from mysql.connector import Error
 
 # Constants
 CATEGORIES = ["General", "Academic", "Administrative", "Events", "Emergency", "Maintenance", "Other"]
 PRIORITIES = ["low", "medium", "high"]
 STATUSES = ["active", "inactive", "expired"]
 
+# Number of notices shown per page in the manage notices tab
+PAGE_SIZE = 20
+
+# Option index lookups for pre-selecting values in select boxes
+CATEGORY_IDX = {c: i for i, c in enumerate(CATEGORIES)}
+PRIORITY_IDX = {p: i for i, p in enumerate(PRIORITIES)}
+STATUS_IDX = {s: i for i, s in enumerate(STATUSES)}
+
+# Session state keys of the add notice form inputs
+ADD_NOTICE_FORM_KEYS = (
+    'add_notice_title', 'add_notice_category', 'add_notice_priority',
+    'add_notice_status', 'add_notice_expires_at', 'add_notice_content'
+)
+
+PRIORITY_COLOR = {
+    'high': '🔴',
+    'medium': '🟡',
+    'low': '🟢'
+}
+
+STATUS_COLOR = {
+    'active': '✅',
+    'inactive': '⏸️',
+    'expired': '❌'
+}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_fetch_notices(filter_tuple):
+    """Cached wrapper around db.fetch_notices, keyed on the sorted filter items."""
+    return db.fetch_notices(dict(filter_tuple))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_count_notices(filter_tuple):
+    """Cached wrapper around db.count_notices, keyed on the sorted filter items."""
+    return db.count_notices(dict(filter_tuple))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_get_notice_by_id(notice_id: int):
+    """Cached wrapper around db.get_notice_by_id."""
+    return db.get_notice_by_id(notice_id)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_stats():
+    """Cached wrapper around db.get_notice_statistics."""
+    return db.get_notice_statistics()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_stats_frames():
+    """DataFrames for the category, priority and status breakdowns."""
+    import pandas as pd
+    
+    stats = _cached_stats()
+    return (
+        pd.DataFrame(stats['by_category']),
+        pd.DataFrame(stats['by_priority']),
+        pd.DataFrame(stats['by_status'])
+    )
+
+@st.cache_resource(show_spinner=False)
+def _fig_category(categories_df):
+    """Category pie chart, keyed on the category breakdown DataFrame."""
+    import plotly.express as px
+    
+    return px.pie(
+        categories_df,
+        values='count',
+        names='category',
+        title='Distribution by Category'
+    )
+
+@st.cache_resource(show_spinner=False)
+def _fig_priority(priorities_df):
+    """Priority bar chart, keyed on the priority breakdown DataFrame."""
+    import plotly.express as px
+    
+    return px.bar(
+        priorities_df,
+        x='priority',
+        y='count',
+        title='Distribution by Priority',
+        color='priority',
+        color_discrete_map={
+            'high': '#ff4444',
+            'medium': '#ffaa44',
+            'low': '#44ff44'
+        }
+    )
+
+@st.cache_resource(show_spinner=False)
+def _fig_status(status_df):
+    """Status bar chart, keyed on the status breakdown DataFrame."""
+    import plotly.express as px
+    
+    return px.bar(
+        status_df,
+        x='status',
+        y='count',
+        title='Distribution by Status',
+        color='status',
+        color_discrete_map={
+            'active': '#44ff44',
+            'inactive': '#ffaa44',
+            'expired': '#ff4444'
+        }
+    )
+
+def _clear_notice_caches():
+    """Invalidate cached notice data after a notice is created, updated or deleted."""
+    _cached_fetch_notices.clear()
+    _cached_count_notices.clear()
+    _cached_get_notice_by_id.clear()
+    _cached_stats.clear()
+    _cached_stats_frames.clear()
+    _fig_category.clear()
+    _fig_priority.clear()
+    _fig_status.clear()
+
 def show_admin_dashboard():
     """Main admin dashboard interface."""
     
@@ -26,6 +138,9 @@ def show_admin_dashboard():
         st.error("Access denied. Admin privileges required.")
         return
     
+    # Resolve the current user once for this run
+    user = auth.get_current_user()
+    
     # Back to main dashboard button
     if st.button("← Back to Main Dashboard"):
         st.session_state.show_admin_dashboard = False
@@ -38,7 +153,7 @@ def show_admin_dashboard():
     tab1, tab2, tab3 = st.tabs(["➕ Add Notice", "📋 Manage Notices", "📊 Statistics"])
     
     with tab1:
-        show_add_notice_tab()
+        show_add_notice_tab(user)
     
     with tab2:
         show_manage_notices_tab()
@@ -46,8 +161,51 @@ def show_admin_dashboard():
     with tab3:
         show_statistics_tab()
 
-def show_add_notice_tab():
-    """Tab for adding new notices."""
+def _create_notice_from_form(user: dict):
+    """
+    Submit callback for the add notice form.
+    Runs before the page reruns, so the form inputs can be reset once the
+    notice is created; on a validation or database error they are kept.
+    """
+    title = st.session_state.add_notice_title
+    content = st.session_state.add_notice_content
+    category = st.session_state.add_notice_category
+    
+    if not (title and content and category):
+        st.session_state.add_notice_result = ("error", "⚠️ Please fill in all required fields (Title, Content, Category)")
+        return
+    
+    # Convert expires_at to datetime if provided
+    expires_at = st.session_state.add_notice_expires_at
+    expires_datetime = datetime.combine(expires_at, datetime.min.time()) if expires_at else None
+    
+    try:
+        notice_data = {
+            'title': title,
+            'content': content,
+            'category': category,
+            'priority': st.session_state.add_notice_priority,
+            'status': st.session_state.add_notice_status,
+            'expires_at': expires_datetime,
+            'user_id': user['user_id']
+        }
+        
+        # Insert notice into database
+        notice_id = db.insert_notice(notice_data)
+        _clear_notice_caches()
+        
+    except Exception as e:
+        st.session_state.add_notice_result = ("error", f"❌ Error creating notice: {str(e)}")
+        return
+    
+    # Reset the form inputs to their defaults
+    for key in ADD_NOTICE_FORM_KEYS:
+        st.session_state.pop(key, None)
+    
+    st.session_state.add_notice_result = ("success", f"✅ Notice created successfully! ID: {notice_id}")
+
+def show_add_notice_tab(user: dict):
+    """Tab for adding new notices on behalf of the given user."""
     
     st.header("Add New Notice")
     
@@ -55,122 +213,121 @@ def show_add_notice_tab():
         col1, col2 = st.columns(2)
         
         with col1:
-            title = st.text_input(
+            st.text_input(
                 "Title *",
                 placeholder="Enter notice title",
-                help="Brief, descriptive title for the notice"
+                help="Brief, descriptive title for the notice",
+                key="add_notice_title"
             )
             
-            category = st.selectbox(
+            st.selectbox(
                 "Category *",
                 options=CATEGORIES,
-                help="Select the appropriate category"
+                help="Select the appropriate category",
+                key="add_notice_category"
             )
             
-            priority = st.selectbox(
+            st.selectbox(
                 "Priority",
                 options=PRIORITIES,
                 index=1,  # Default to "medium"
-                help="Set notice priority level"
+                help="Set notice priority level",
+                key="add_notice_priority"
             )
         
         with col2:
-            status = st.selectbox(
+            st.selectbox(
                 "Status",
                 options=STATUSES,
                 index=0,  # Default to "active"
-                help="Set notice status"
+                help="Set notice status",
+                key="add_notice_status"
             )
             
             # Optional expiration date
-            expires_at = st.date_input(
+            st.date_input(
                 "Expiration Date (Optional)",
                 value=None,
-                help="Leave empty for no expiration"
+                help="Leave empty for no expiration",
+                key="add_notice_expires_at"
             )
-            
-            # Convert expires_at to datetime if provided
-            expires_datetime = None
-            if expires_at:
-                expires_datetime = datetime.combine(expires_at, datetime.min.time())
         
         # Content field (full width)
-        content = st.text_area(
+        st.text_area(
             "Content *",
             placeholder="Enter notice content...",
             height=150,
-            help="Detailed content of the notice"
+            help="Detailed content of the notice",
+            key="add_notice_content"
         )
         
-        # Form submission
-        submitted = st.form_submit_button("🚀 Create Notice", use_container_width=True)
-        
-        if submitted:
-            if title and content and category:
-                try:
-                    # Get current user
-                    user = auth.get_current_user()
-                    
-                    notice_data = {
-                        'title': title,
-                        'content': content,
-                        'category': category,
-                        'priority': priority,
-                        'status': status,
-                        'expires_at': expires_datetime,
-                        'user_id': user['user_id']
-                    }
-                    
-                    # Insert notice into database
-                    notice_id = db.insert_notice(notice_data)
-                    
-                    st.success(f"✅ Notice created successfully! ID: {notice_id}")
-                    st.balloons()
-                    
-                    # Clear form by rerunning
-                    st.rerun()
-                    
-                except Exception as e:
-                    st.error(f"❌ Error creating notice: {str(e)}")
-            else:
-                st.error("⚠️ Please fill in all required fields (Title, Content, Category)")
+        # Form submission; the notice is created in the callback
+        st.form_submit_button(
+            "🚀 Create Notice",
+            use_container_width=True,
+            on_click=_create_notice_from_form,
+            args=(user,)
+        )
+    
+    result = st.session_state.pop('add_notice_result', None)
+    if result:
+        kind, message = result
+        if kind == "success":
+            st.success(message)
+            st.balloons()
+        else:
+            st.error(message)
 
 def show_manage_notices_tab():
     """Tab for managing existing notices."""
     
     st.header("Manage Notices")
     
-    # Filters section
+    # Initial filter values come from the URL so filtered views can be shared
+    query = st.query_params
+    
+    # Filters section; widgets inside the form only rerun the page on submit
     with st.expander("🔍 Search & Filter Options", expanded=True):
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            search_term = st.text_input(
-                "Search",
-                placeholder="Search in title/content...",
-                help="Search for notices by title or content"
-            )
-        
-        with col2:
-            filter_category = st.selectbox(
-                "Filter by Category",
-                options=["All"] + CATEGORIES,
-                help="Filter notices by category"
-            )
-        
-        with col3:
-            filter_priority = st.selectbox(
-                "Filter by Priority",
-                options=["All"] + PRIORITIES,
-                help="Filter notices by priority"
-            )
-        
-        with col4:
-            filter_status = st.selectbox(
-                "Filter by Status",
-                options=["All"] + STATUSES,
-                help="Filter notices by status"
-            )
+        with st.form("notice_filters_form", border=False):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                search_term = st.text_input(
+                    "Search",
+                    value=query.get('search', ''),
+                    key="filter_search",
+                    placeholder="Search in title/content...",
+                    help="Search for notices by title or content"
+                )
+            
+            with col2:
+                filter_category = st.selectbox(
+                    "Filter by Category",
+                    options=["All"] + CATEGORIES,
+                    index=CATEGORY_IDX.get(query.get('category'), -1) + 1,
+                    key="filter_category",
+                    help="Filter notices by category"
+                )
+            
+            with col3:
+                filter_priority = st.selectbox(
+                    "Filter by Priority",
+                    options=["All"] + PRIORITIES,
+                    index=PRIORITY_IDX.get(query.get('priority'), -1) + 1,
+                    key="filter_priority",
+                    help="Filter notices by priority"
+                )
+            
+            with col4:
+                filter_status = st.selectbox(
+                    "Filter by Status",
+                    options=["All"] + STATUSES,
+                    index=STATUS_IDX.get(query.get('status'), -1) + 1,
+                    key="filter_status",
+                    help="Filter notices by status"
+                )
+            
+            apply_filters = st.form_submit_button("🔍 Apply Filters")
     
     # Build filters dictionary
     filters = {}
@@ -183,80 +340,90 @@ def show_manage_notices_tab():
     if filter_status != "All":
         filters['status'] = filter_status
     
+    if apply_filters:
+        st.query_params.from_dict(filters)
+    
+    # Start from the first page whenever the filters change
+    filter_key = tuple(sorted(filters.items()))
+    if st.session_state.get('notice_filters') != filter_key:
+        st.session_state.notice_filters = filter_key
+        st.session_state.notice_page = 0
+    
     try:
-        # Fetch notices from database
-        notices = db.fetch_notices(filters)
+        # Fetch the current page of notices from database
+        total_notices = _cached_count_notices(filter_key)
+        page_count = max(1, -(-total_notices // PAGE_SIZE))
+        page = min(st.session_state.get('notice_page', 0), page_count - 1)
+        
+        page_filters = {**filters, 'limit': PAGE_SIZE, 'offset': page * PAGE_SIZE}
+        notices = _cached_fetch_notices(tuple(sorted(page_filters.items())))
         
         if notices:
             # Display notices count
-            st.info(f"Found {len(notices)} notice(s)")
+            st.info(f"Found {total_notices} notice(s)")
             
-            # Convert to DataFrame for better display
-            df = pd.DataFrame(notices)
+            # Display notices as a single selectable table
+            records = [
+                {
+                    'ID': n['id'],
+                    'Title': n['title'],
+                    'Category': n['category'],
+                    'Priority': f"{PRIORITY_COLOR.get(n['priority'], '🟡')} {n['priority'].title()}",
+                    'Status': f"{STATUS_COLOR.get(n['status'], '❓')} {n['status'].title()}",
+                    'Author': n['username'],
+                    'Created': n['created_at']
+                }
+                for n in notices
+            ]
             
-            # Format datetime columns
-            if 'created_at' in df.columns:
-                df['created_at'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-            if 'updated_at' in df.columns:
-                df['updated_at'] = pd.to_datetime(df['updated_at']).dt.strftime('%Y-%m-%d %H:%M')
+            event = st.dataframe(
+                records,
+                key="notices_table",
+                on_select="rerun",
+                selection_mode="single-row",
+                hide_index=True,
+                use_container_width=True
+            )
             
-            # Display notices in a more user-friendly format
-            for i, notice in enumerate(notices):
-                with st.container():
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        # Notice header
-                        priority_color = {
-                            'high': '🔴',
-                            'medium': '🟡',
-                            'low': '🟢'
-                        }
-                        
-                        status_color = {
-                            'active': '✅',
-                            'inactive': '⏸️',
-                            'expired': '❌'
-                        }
-                        
-                        st.markdown(
-                            f"**{priority_color.get(notice['priority'], '🟡')} {notice['title']}** "
-                            f"({status_color.get(notice['status'], '❓')} {notice['status'].title()})"
-                        )
-                        
-                        # Notice details
-                        st.markdown(f"**Category:** {notice['category']} | **Priority:** {notice['priority'].title()}")
-                        st.markdown(f"**Created:** {notice['created_at']} | **Author:** {notice['username']}")
-                        
-                        # Content preview
-                        content_preview = notice['content'][:200] + "..." if len(notice['content']) > 200 else notice['content']
-                        st.markdown(f"**Content:** {content_preview}")
-                    
-                    with col2:
-                        # Action buttons
-                        col2a, col2b = st.columns(2)
-                        
-                        with col2a:
-                            if st.button("✏️ Edit", key=f"edit_{notice['id']}"):
-                                st.session_state.edit_notice_id = notice['id']
-                                st.rerun()
-                        
-                        with col2b:
-                            if st.button("🗑️ Delete", key=f"delete_{notice['id']}"):
-                                if st.session_state.get(f"confirm_delete_{notice['id']}", False):
-                                    # Actually delete
-                                    try:
-                                        db.delete_notice(notice['id'])
-                                        st.success(f"Notice '{notice['title']}' deleted successfully!")
-                                        st.rerun()
-                                    except Exception as e:
-                                        st.error(f"Error deleting notice: {str(e)}")
-                                else:
-                                    # Show confirmation
-                                    st.session_state[f"confirm_delete_{notice['id']}"] = True
-                                    st.warning("Click again to confirm deletion")
-                    
-                    st.markdown("---")
+            selected_rows = [i for i in event.selection.rows if i < len(notices)]
+            
+            if selected_rows:
+                notice = notices[selected_rows[0]]
+                
+                # Content preview of the selected notice
+                with st.expander(f"📄 {notice['title']}", expanded=True):
+                    content_preview = notice['preview'] + "..." if notice['content_len'] > db.PREVIEW_LENGTH else notice['preview']
+                    st.markdown(f"**Content:** {content_preview}")
+                
+                # Action buttons
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    if st.button("✏️ Edit selected", key="edit_selected", use_container_width=True):
+                        st.session_state.edit_notice_id = notice['id']
+                        st.rerun()
+                
+                with col2:
+                    if st.button("🗑️ Delete selected", key="delete_selected", use_container_width=True):
+                        confirm_delete_notice(notice['id'], notice['title'])
+            else:
+                st.caption("Select a notice in the table to edit or delete it.")
+            
+            # Pagination controls
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            
+            with col_prev:
+                if st.button("◀ Prev", key="notice_page_prev", disabled=page == 0):
+                    st.session_state.notice_page = page - 1
+                    st.rerun()
+            
+            with col_page:
+                st.markdown(f"Page {page + 1} of {page_count}")
+            
+            with col_next:
+                if st.button("Next ▶", key="notice_page_next", disabled=page >= page_count - 1):
+                    st.session_state.notice_page = page + 1
+                    st.rerun()
             
             # Handle edit notice
             if 'edit_notice_id' in st.session_state:
@@ -268,6 +435,27 @@ def show_manage_notices_tab():
     except Exception as e:
         st.error(f"Error loading notices: {str(e)}")
 
+@st.dialog("Confirm delete")
+def confirm_delete_notice(notice_id: int, title: str):
+    """Dialog asking for confirmation before deleting a notice."""
+    
+    st.write(f"Delete notice '{title}'? This cannot be undone.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🗑️ Delete", type="primary", use_container_width=True):
+            try:
+                db.delete_notice(notice_id)
+                _clear_notice_caches()
+                st.toast(f"Notice '{title}' deleted successfully!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error deleting notice: {str(e)}")
+    
+    with col2:
+        if st.button("Cancel", use_container_width=True):
+            st.rerun()
+
 def show_edit_notice_modal(notice_id: int):
     """Modal for editing an existing notice."""
     
@@ -276,7 +464,7 @@ def show_edit_notice_modal(notice_id: int):
     
     try:
         # Get notice data
-        notice = db.get_notice_by_id(notice_id)
+        notice = _cached_get_notice_by_id(notice_id)
         
         if not notice:
             st.error("Notice not found!")
@@ -293,19 +481,19 @@ def show_edit_notice_modal(notice_id: int):
                 category = st.selectbox(
                     "Category *",
                     options=CATEGORIES,
-                    index=CATEGORIES.index(notice['category']) if notice['category'] in CATEGORIES else 0
+                    index=CATEGORY_IDX.get(notice['category'], 0)
                 )
                 priority = st.selectbox(
                     "Priority",
                     options=PRIORITIES,
-                    index=PRIORITIES.index(notice['priority']) if notice['priority'] in PRIORITIES else 1
+                    index=PRIORITY_IDX.get(notice['priority'], 1)
                 )
             
             with col2:
                 status = st.selectbox(
                     "Status",
                     options=STATUSES,
-                    index=STATUSES.index(notice['status']) if notice['status'] in STATUSES else 0
+                    index=STATUS_IDX.get(notice['status'], 0)
                 )
                 
                 # Handle expiration date
@@ -340,6 +528,7 @@ def show_edit_notice_modal(notice_id: int):
                             }
                             
                             success = db.update_notice(notice_id, update_data)
+                            _clear_notice_caches()
                             
                             if success:
                                 st.success("✅ Notice updated successfully!")
@@ -368,7 +557,8 @@ def show_statistics_tab():
     
     try:
         # Get statistics from database
-        stats = db.get_notice_statistics()
+        stats = _cached_stats()
+        categories_df, priorities_df, status_df = _cached_stats_frames()
         
         # Display key metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -412,13 +602,7 @@ def show_statistics_tab():
             st.subheader("📈 Notices by Category")
             if stats['by_category']:
                 # Create pie chart for categories
-                categories_df = pd.DataFrame(stats['by_category'])
-                fig_category = px.pie(
-                    categories_df,
-                    values='count',
-                    names='category',
-                    title='Distribution by Category'
-                )
+                fig_category = _fig_category(categories_df)
                 st.plotly_chart(fig_category, use_container_width=True)
             else:
                 st.info("No category data available")
@@ -427,19 +611,7 @@ def show_statistics_tab():
             st.subheader("🎯 Notices by Priority")
             if stats['by_priority']:
                 # Create bar chart for priorities
-                priorities_df = pd.DataFrame(stats['by_priority'])
-                fig_priority = px.bar(
-                    priorities_df,
-                    x='priority',
-                    y='count',
-                    title='Distribution by Priority',
-                    color='priority',
-                    color_discrete_map={
-                        'high': '#ff4444',
-                        'medium': '#ffaa44',
-                        'low': '#44ff44'
-                    }
-                )
+                fig_priority = _fig_priority(priorities_df)
                 st.plotly_chart(fig_priority, use_container_width=True)
             else:
                 st.info("No priority data available")
@@ -447,19 +619,7 @@ def show_statistics_tab():
         # Status distribution
         st.subheader("📊 Notices by Status")
         if stats['by_status']:
-            status_df = pd.DataFrame(stats['by_status'])
-            fig_status = px.bar(
-                status_df,
-                x='status',
-                y='count',
-                title='Distribution by Status',
-                color='status',
-                color_discrete_map={
-                    'active': '#44ff44',
-                    'inactive': '#ffaa44',
-                    'expired': '#ff4444'
-                }
-            )
+            fig_status = _fig_status(status_df)
             st.plotly_chart(fig_status, use_container_width=True)
         else:
             st.info("No status data available")
@@ -472,7 +632,7 @@ def show_statistics_tab():
         with tab1:
             if stats['by_category']:
                 st.dataframe(
-                    pd.DataFrame(stats['by_category']),
+                    categories_df,
                     use_container_width=True
                 )
             else:
@@ -481,7 +641,7 @@ def show_statistics_tab():
         with tab2:
             if stats['by_priority']:
                 st.dataframe(
-                    pd.DataFrame(stats['by_priority']),
+                    priorities_df,
                     use_container_width=True
                 )
             else:
@@ -490,7 +650,7 @@ def show_statistics_tab():
         with tab3:
             if stats['by_status']:
                 st.dataframe(
-                    pd.DataFrame(stats['by_status']),
+                    status_df,
                     use_container_width=True
                 )
             else:
@@ -514,10 +674,7 @@ def main():
     
     # For testing, set admin session state
     if not auth.is_authenticated():
-        st.session_state.logged_in = True
-        st.session_state.username = "admin"
-        st.session_state.role = "admin"
-        st.session_state.user_id = 1
+        auth.set_current_user({'id': 1, 'username': "admin", 'role': "admin"})
     
     show_admin_dashboard()
 
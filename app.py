@@ -4,7 +4,17 @@ Handles user authentication and routing based on login status.
 """
 
 import streamlit as st
+from mysql.connector import Error
 import auth
+import db
+
+@st.cache_resource(show_spinner=False)
+def _initialize_database():
+    """
+    Create missing tables and indexes, including the FULLTEXT index notice
+    search relies on, once per server process.
+    """
+    db.initialize_database()
 
 def main():
     """Main application entry point."""
@@ -20,8 +30,15 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Bring the schema up to date; a failure is not cached, so it is retried on
+    # the next run, and hard-coded users can still log in meanwhile
+    try:
+        _initialize_database()
+    except Error:
+        pass
+    
     # Main application logic
-    if not st.session_state.logged_in:
+    if not auth.is_authenticated():
         # Show login page if user is not logged in
         show_login_page()
     else:
@@ -77,15 +94,8 @@ def show_login_page():
         with st.expander("🔍 Demo User Accounts", expanded=False):
             st.markdown("**Available test accounts:**")
             
-            demo_users = [
-                ("admin", "admin123", "Administrator with full access"),
-                ("user", "user123", "Regular user account"),
-                ("john_doe", "password123", "Demo user account"),
-                ("jane_admin", "admin456", "Demo admin account")
-            ]
-            
-            for username, password, description in demo_users:
-                st.markdown(f"- **{username}** (Password: `{password}`) - {description}")
+            for username, info in auth.AVAILABLE_USERS.items():
+                st.markdown(f"- **{username}** (Password: `{info['password']}`) - {info['description']}")
 
 def show_main_app():
     """Display the main application interface for logged-in users."""
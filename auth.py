@@ -6,9 +6,15 @@ database integration, and Streamlit session state management.
 
 import streamlit as st
 import hashlib
-from typing import Optional, Dict, Any
+import hmac
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Union
 import logging
-from db import verify_user, get_db_connection
+from dataclasses import dataclass
+from db import fetch_active_users, get_db_connection
 from mysql.connector import Error
 
 # Configure logging
@@ -20,39 +26,139 @@ HARDCODED_USERS = {
         'password': 'admin123',  # In production, this should be hashed
         'role': 'admin',
         'email': 'admin@noticeboard.com',
-        'id': 1
+        'id': 1,
+        'description': 'Administrator with full access'
     },
     'user': {
         'password': 'user123',   # In production, this should be hashed
         'role': 'user',
         'email': 'user@noticeboard.com',
-        'id': 2
+        'id': 2,
+        'description': 'Regular user'
     },
     'john_doe': {
         'password': 'password123',
         'role': 'user',
         'email': 'john.doe@example.com',
-        'id': 3
+        'id': 3,
+        'description': 'Demo user account'
     },
     'jane_admin': {
         'password': 'admin456',
         'role': 'admin',
         'email': 'jane.admin@example.com',
-        'id': 4
+        'id': 4,
+        'description': 'Demo admin account'
     }
 }
 
-def hash_password(password: str) -> str:
+@dataclass(frozen=True)
+class AuthState:
+    """Authentication state of a session, stored under st.session_state['_auth']."""
+    logged_in: bool = False
+    username: Optional[str] = None
+    role: Optional[str] = None
+    user_id: Optional[int] = None
+    email: str = ''
+
+# Longest credentials accepted by login (users.username is VARCHAR(50))
+MAX_USERNAME_LENGTH = 50
+MAX_PASSWORD_LENGTH = 128
+
+# Session state key holding the AuthState, and the state of a logged-out session
+AUTH_STATE_KEY = '_auth'
+_LOGGED_OUT = AuthState()
+
+# Salted PBKDF2 parameters for stored password hashes
+PASSWORD_HASH_SCHEME = 'pbkdf2_sha256'
+PASSWORD_HASH_ITERATIONS = 200_000
+PASSWORD_SALT_BYTES = 16
+
+# Recently verified (stored hash, password HMAC) pairs, least recently used first
+VERIFIED_CACHE_SIZE = 1024
+_VERIFIED: "OrderedDict[Tuple[str, bytes], bool]" = OrderedDict()
+_VERIFIED_LOCK = threading.Lock()
+_VERIFIED_CACHE_KEY = os.urandom(32)
+
+# SHA-256 digests of the hard-coded passwords, computed once at import
+_HARDCODED_BY_DIGEST = {
+    username: (hashlib.sha256(user['password'].encode()).digest(), user)
+    for username, user in HARDCODED_USERS.items()
+}
+
+def hash_password(password: Union[str, bytes]) -> str:
+    """
+    Hash a password for storage using salted PBKDF2-HMAC-SHA256.
+    
+    Args:
+        password (str or bytes): Plain text password; bytes are hashed as-is
+        
+    Returns:
+        str: Hash in the form pbkdf2_sha256$<iterations>$<salt hex>$<key hex>
+    """
+    if isinstance(password, str):
+        password = password.encode()
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    key = hashlib.pbkdf2_hmac('sha256', password, salt, PASSWORD_HASH_ITERATIONS)
+    return f"{PASSWORD_HASH_SCHEME}${PASSWORD_HASH_ITERATIONS}${salt.hex()}${key.hex()}"
+
+def _verify_password_hash(password: bytes, stored_hash: str) -> bool:
     """
-    Hash a password using SHA-256.
+    Check a password against a stored hash without caching.
+    
+    Args:
+        password (bytes): Encoded plain text password
+        stored_hash (str): Hash from the users table
+        
+    Returns:
+        bool: True if the password matches
+    """
+    if stored_hash.startswith(PASSWORD_HASH_SCHEME + '$'):
+        try:
+            _, iterations, salt, key = stored_hash.split('$')
+            expected = bytes.fromhex(key)
+            derived = hashlib.pbkdf2_hmac('sha256', password, bytes.fromhex(salt), int(iterations))
+        except ValueError:
+            logger.warning("Malformed password hash in users table")
+            return False
+        return hmac.compare_digest(derived, expected)
+    
+    # Unsalted SHA-256 hex digests written before PBKDF2 was introduced
+    return hmac.compare_digest(stored_hash.encode(), hashlib.sha256(password).hexdigest().encode())
+
+def check_password(password: str, stored_hash: str) -> bool:
+    """
+    Verify a password against a stored hash.
+    Accepts PBKDF2 hashes from hash_password and legacy SHA-256 hex digests.
+    
+    Successful checks are remembered so repeated logins skip the key
+    derivation. Entries are keyed by an HMAC of the password under a random
+    per-process key, so the cache holds nothing that a dictionary of
+    unsalted hashes could reverse.
     
     Args:
         password (str): Plain text password
+        stored_hash (str): Hash from the users table
         
     Returns:
-        str: Hashed password
+        bool: True if the password matches
     """
-    return hashlib.sha256(password.encode()).hexdigest()
+    password = password.encode()
+    cache_key = (stored_hash, hmac.new(_VERIFIED_CACHE_KEY, password, hashlib.sha256).digest())
+    
+    with _VERIFIED_LOCK:
+        if cache_key in _VERIFIED:
+            _VERIFIED.move_to_end(cache_key)
+            return True
+    
+    if not _verify_password_hash(password, stored_hash):
+        return False
+    
+    with _VERIFIED_LOCK:
+        _VERIFIED[cache_key] = True
+        if len(_VERIFIED) > VERIFIED_CACHE_SIZE:
+            _VERIFIED.popitem(last=False)
+    return True
 
 def verify_hardcoded_credentials(username: str, password: str) -> Optional[Dict[str, Any]]:
     """
@@ -65,10 +171,10 @@ def verify_hardcoded_credentials(username: str, password: str) -> Optional[Dict[
     Returns:
         dict or None: User information if credentials are valid, None otherwise
     """
-    if username in HARDCODED_USERS:
-        stored_user = HARDCODED_USERS[username]
-        if stored_user['password'] == password:
-            logger.info(f"Hard-coded user {username} verified successfully")
+    digest, stored_user = _HARDCODED_BY_DIGEST.get(username, (None, None))
+    if digest is not None:
+        if hmac.compare_digest(digest, hashlib.sha256(password.encode()).digest()):
+            logger.info("Hard-coded user %s verified successfully", username)
             return {
                 'id': stored_user['id'],
                 'username': username,
@@ -78,72 +184,170 @@ def verify_hardcoded_credentials(username: str, password: str) -> Optional[Dict[
                 'last_login': None
             }
     
-    logger.warning(f"Failed hard-coded verification for user {username}")
+    logger.warning("Failed hard-coded verification for user %s", username)
     return None
 
-def login(username: str, password: str) -> Optional[str]:
+def _clean_username(username: str, password: str) -> Optional[str]:
     """
-    Authenticate user and return their role.
-    First tries database authentication, then falls back to hard-coded credentials.
+    Strip the username and reject empty or oversized credentials.
     
     Args:
-        username (str): Username to authenticate
-        password (str): Password to authenticate
+        username (str): Username as entered
+        password (str): Password as entered
         
     Returns:
-        str or None: User role if authentication successful, None otherwise
+        str or None: Stripped username, or None if the credentials are unusable
     """
+    username = username.strip() if username else username
+    
     if not username or not password:
         logger.warning("Login attempted with empty username or password")
         return None
     
-    user_info = None
+    # Reject oversized input before hashing or touching the database
+    if len(username) > MAX_USERNAME_LENGTH or len(password) > MAX_PASSWORD_LENGTH:
+        logger.warning("Login attempted with oversized username or password")
+        return None
     
-    # Try database authentication first
-    try:
-        hashed_password = hash_password(password)
-        user_info = verify_user(username, hashed_password)
+    return username
+
+def _fetch_db_users(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch active database users for authentication.
+    
+    Args:
+        usernames (list): Cleaned usernames to look up
         
-        if user_info:
-            logger.info(f"Database authentication successful for user {username}")
-        else:
-            logger.info(f"Database authentication failed for user {username}, trying hard-coded credentials")
-            # Fallback to hard-coded credentials
-            user_info = verify_hardcoded_credentials(username, password)
-            
+    Returns:
+        dict: Users as returned by fetch_active_users, or an empty dict if the
+            database is unavailable so that hard-coded credentials still work
+    """
+    try:
+        return fetch_active_users(usernames)
     except Error as e:
-        logger.error(f"Database error during authentication: {e}")
+        logger.error("Database error during authentication: %s", e)
         logger.info("Falling back to hard-coded credentials due to database error")
-        # Fallback to hard-coded credentials on database error
-        user_info = verify_hardcoded_credentials(username, password)
+        return {}
+
+def _authenticate(username: str, password: str, db_users: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Check one credential pair against database users, then hard-coded users.
+    
+    Args:
+        username (str): Username already cleaned by _clean_username
+        password (str): Password to check
+        db_users (dict): Users from _fetch_db_users, keyed by casefolded username
+        
+    Returns:
+        dict or None: User information without the password hash, or None
+    """
+    # Usernames compare case-insensitively, as under the users table's collation
+    db_user = db_users.get(username.casefold())
+    if db_user and check_password(password, db_user['password']):
+        logger.info("Database authentication successful for user %s", username)
+        return {key: value for key, value in db_user.items() if key != 'password'}
+    
+    logger.info("Database authentication failed for user %s, trying hard-coded credentials", username)
+    return verify_hardcoded_credentials(username, password)
+
+def login(username: str, password: str) -> Optional[str]:
+    """
+    Authenticate user and return their role.
+    First tries database authentication, then falls back to hard-coded credentials.
+    
+    Args:
+        username (str): Username to authenticate
+        password (str): Password to authenticate
+        
+    Returns:
+        str or None: User role if authentication successful, None otherwise
+    """
+    username = _clean_username(username, password)
+    if username is None:
+        return None
+    
+    user_info = _authenticate(username, password, _fetch_db_users([username]))
     
     if user_info:
         # Update session state
-        st.session_state.logged_in = True
-        st.session_state.username = user_info['username']
-        st.session_state.role = user_info['role']
-        st.session_state.user_id = user_info['id']
-        st.session_state.email = user_info.get('email', '')
+        set_current_user(user_info)
         
-        logger.info(f"User {username} logged in successfully with role {user_info['role']}")
+        logger.info("User %s logged in successfully with role %s", username, user_info['role'])
         return user_info['role']
     
-    logger.warning(f"Authentication failed for user {username}")
+    logger.warning("Authentication failed for user %s", username)
     return None
 
+def login_many(credentials: List[Tuple[str, str]]) -> List[Optional[str]]:
+    """
+    Authenticate a batch of credentials without touching session state.
+    All users are fetched in a single database query, then each pair goes
+    through the same checks as login.
+    
+    Args:
+        credentials (list): (username, password) pairs to authenticate
+        
+    Returns:
+        list: User role, or None if authentication failed, for each pair in order
+    """
+    usernames = [_clean_username(username, password) for username, password in credentials]
+    db_users = _fetch_db_users(sorted({username for username in usernames if username}))
+    
+    def authenticate(username: Optional[str], password: str) -> Optional[str]:
+        if username is None:
+            return None
+        
+        user_info = _authenticate(username, password, db_users)
+        return user_info['role'] if user_info else None
+    
+    # Repeated (username, password) pairs in the batch are only checked once
+    pairs = list(zip(usernames, (password for _, password in credentials)))
+    unique_pairs = list(dict.fromkeys(pairs))
+    
+    if len(unique_pairs) < 2:
+        roles = [authenticate(*pair) for pair in unique_pairs]
+    else:
+        # hashlib releases the GIL while deriving PBKDF2 keys, so checks overlap across threads
+        with ThreadPoolExecutor(max_workers=min(len(unique_pairs), os.cpu_count() or 1)) as executor:
+            roles = list(executor.map(authenticate, *zip(*unique_pairs)))
+    
+    role_by_pair = dict(zip(unique_pairs, roles))
+    return [role_by_pair[pair] for pair in pairs]
+
+def get_auth_state() -> AuthState:
+    """
+    Get the authentication state of the current session.
+    
+    Returns:
+        AuthState: Current state, or a logged-out state if none is stored
+    """
+    return st.session_state.get(AUTH_STATE_KEY, _LOGGED_OUT)
+
+def set_current_user(user_info: Dict[str, Any]):
+    """
+    Mark the session as logged in as the given user.
+    
+    Args:
+        user_info (dict): User record with id, username, role and optional email
+    """
+    st.session_state[AUTH_STATE_KEY] = AuthState(
+        logged_in=True,
+        username=user_info['username'],
+        role=user_info['role'],
+        user_id=user_info['id'],
+        email=user_info.get('email') or ''
+    )
+
 def logout():
     """
     Log out the current user by clearing session state.
     """
-    username = st.session_state.get('username', 'Unknown')
+    username = get_auth_state().username or 'Unknown'
     
-    # Clear all authentication-related session state
-    keys_to_clear = ['logged_in', 'username', 'role', 'user_id', 'email']
-    for key in keys_to_clear:
-        if key in st.session_state:
-            del st.session_state[key]
+    # Clear the authentication state
+    st.session_state.pop(AUTH_STATE_KEY, None)
     
-    logger.info(f"User {username} logged out successfully")
+    logger.info("User %s logged out successfully", username)
 
 def is_authenticated() -> bool:
     """
@@ -152,7 +356,7 @@ def is_authenticated() -> bool:
     Returns:
         bool: True if user is logged in, False otherwise
     """
-    return st.session_state.get('logged_in', False)
+    return get_auth_state().logged_in
 
 def get_current_user() -> Optional[Dict[str, Any]]:
     """
@@ -161,12 +365,13 @@ def get_current_user() -> Optional[Dict[str, Any]]:
     Returns:
         dict or None: Current user information if logged in, None otherwise
     """
-    if is_authenticated():
+    state = get_auth_state()
+    if state.logged_in:
         return {
-            'username': st.session_state.get('username'),
-            'role': st.session_state.get('role'),
-            'user_id': st.session_state.get('user_id'),
-            'email': st.session_state.get('email', '')
+            'username': state.username,
+            'role': state.role,
+            'user_id': state.user_id,
+            'email': state.email
         }
     return None
 
@@ -177,7 +382,7 @@ def get_user_role() -> Optional[str]:
     Returns:
         str or None: Current user's role if logged in, None otherwise
     """
-    return st.session_state.get('role')
+    return get_auth_state().role
 
 def is_admin() -> bool:
     """
@@ -186,7 +391,7 @@ def is_admin() -> bool:
     Returns:
         bool: True if current user is admin, False otherwise
     """
-    return st.session_state.get('role') == 'admin'
+    return get_auth_state().role == 'admin'
 
 def require_auth(redirect_to_login=True):
     """
@@ -264,20 +469,8 @@ def initialize_session_state():
     """
     Initialize session state variables if they don't exist.
     """
-    if 'logged_in' not in st.session_state:
-        st.session_state.logged_in = False
-    
-    if 'username' not in st.session_state:
-        st.session_state.username = None
-    
-    if 'role' not in st.session_state:
-        st.session_state.role = None
-    
-    if 'user_id' not in st.session_state:
-        st.session_state.user_id = None
-    
-    if 'email' not in st.session_state:
-        st.session_state.email = None
+    if AUTH_STATE_KEY not in st.session_state:
+        st.session_state[AUTH_STATE_KEY] = _LOGGED_OUT
 
 def preload_demo_users():
     """
@@ -297,50 +490,36 @@ def preload_demo_users():
                 
                 # Insert demo users
                 demo_users = [
-                    ('admin', 'admin@noticeboard.com', hash_password('admin123'), 'admin'),
-                    ('user', 'user@noticeboard.com', hash_password('user123'), 'user'),
-                    ('john_doe', 'john.doe@example.com', hash_password('password123'), 'user'),
-                    ('jane_admin', 'jane.admin@example.com', hash_password('admin456'), 'admin')
+                    (username, user['email'], hash_password(user['password']), user['role'])
+                    for username, user in HARDCODED_USERS.items()
                 ]
                 
-                insert_query = """
+                # Single multi-row INSERT: one round-trip for all demo users
+                placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(demo_users))
+                insert_query = f"""
                     INSERT INTO users (username, email, password, role)
-                    VALUES (%s, %s, %s, %s)
+                    VALUES {placeholders}
                 """
                 
-                cursor.executemany(insert_query, demo_users)
+                cursor.execute(insert_query, [value for row in demo_users for value in row])
                 connection.commit()
                 
-                logger.info(f"Preloaded {len(demo_users)} demo users into database")
+                logger.info("Preloaded %d demo users into database", len(demo_users))
             
             cursor.close()
             
     except Error as e:
-        logger.error(f"Error preloading demo users: {e}")
+        logger.error("Error preloading demo users: %s", e)
         # Don't raise the error, just log it - hard-coded credentials will work as fallback
 
 # Available users information for documentation/testing
 AVAILABLE_USERS = {
-    'admin': {
-        'password': 'admin123',
-        'role': 'admin',
-        'description': 'Administrator with full access'
-    },
-    'user': {
-        'password': 'user123',
-        'role': 'user',
-        'description': 'Regular user'
-    },
-    'john_doe': {
-        'password': 'password123',
-        'role': 'user',
-        'description': 'Demo user account'
-    },
-    'jane_admin': {
-        'password': 'admin456',
-        'role': 'admin',
-        'description': 'Demo admin account'
+    username: {
+        'password': user['password'],
+        'role': user['role'],
+        'description': user['description']
     }
+    for username, user in HARDCODED_USERS.items()
 }
 
 def show_available_users():
@@ -7,6 +7,8 @@ import mysql.connector
 from mysql.connector import Error, pooling
 from typing import Optional, Dict, List, Any, Tuple
 import os
+import re
+import functools
 from contextlib import contextmanager
 import logging
 
@@ -14,25 +16,88 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Database configuration
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', 3306)),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'database': os.getenv('DB_NAME', 'notice_board'),
-    'charset': 'utf8mb4',
-    'use_unicode': True,
-    'autocommit': False
-}
+@functools.lru_cache(maxsize=None)
+def _db_config() -> Dict[str, Any]:
+    """
+    Database configuration, read from the environment on first use.
+    
+    Returns:
+        dict: Connection arguments for mysql.connector
+    """
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'notice_board'),
+        'charset': 'utf8mb4',
+        'use_unicode': True,
+        'autocommit': False,
+        'connection_timeout': 5
+    }
+
+@functools.lru_cache(maxsize=None)
+def _pool_config() -> Dict[str, Any]:
+    """
+    Connection pool configuration, built on first use.
+    
+    Returns:
+        dict: Arguments for pooling.MySQLConnectionPool
+    """
+    return {
+        'pool_name': 'notice_board_pool',
+        # Every pooled connection is opened when the pool is created;
+        # mysql-connector allows at most 32
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'pool_reset_session': True,
+        **_db_config()
+    }
+
+# Secondary indexes added to existing tables by initialize_database
+INDEX_MIGRATIONS = [
+    ('users', 'idx_username_status',
+     "CREATE INDEX idx_username_status ON users (username, status)"),
+    ('notices', 'idx_notices_status_cat_prio_created',
+     "CREATE INDEX idx_notices_status_cat_prio_created "
+     "ON notices (status, category, priority, created_at DESC)"),
+    ('notices', 'ft_notice',
+     "ALTER TABLE notices ADD FULLTEXT ft_notice (title, content)"),
+]
+
+# Shortest search term the FULLTEXT index can match (innodb_ft_min_token_size)
+FULLTEXT_MIN_TOKEN_SIZE = 3
+
+# InnoDB's default FULLTEXT stopwords (INNODB_FT_DEFAULT_STOPWORD), which are never indexed
+FULLTEXT_STOPWORDS = frozenset({
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en',
+    'for', 'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who',
+    'will', 'with', 'und', 'www'
+})
 
-# Connection pool configuration
-POOL_CONFIG = {
-    'pool_name': 'notice_board_pool',
-    'pool_size': 5,
-    'pool_reset_session': True,
-    **DB_CONFIG
-}
+# Number of content characters shown in notice list previews
+PREVIEW_LENGTH = 200
+
+# Row cap applied by fetch_notices when the caller gives no limit
+DEFAULT_LIMIT = 1000
+
+# Notice list query up to and including its WHERE keyword; filter
+# conditions are appended as " AND ..." fragments
+_NOTICE_LIST_SELECT = """
+    SELECT n.id, n.title, LEFT(n.content, %s) AS preview,
+           CHAR_LENGTH(n.content) AS content_len,
+           n.category, n.status, n.priority,
+           DATE_FORMAT(n.created_at, '%Y-%m-%d %H:%i') AS created_at,
+           DATE_FORMAT(n.updated_at, '%Y-%m-%d %H:%i') AS updated_at,
+           n.expires_at, n.user_id,
+           u.username, u.email
+    FROM notices n
+    LEFT JOIN users u ON n.user_id = u.id
+    WHERE 1=1
+"""
+
+# fetch_notices SQL for the unfiltered case
+_FETCH_ALL_QUERY = _NOTICE_LIST_SELECT + " ORDER BY n.created_at DESC LIMIT %s"
 
 # Initialize connection pool
 _connection_pool = None
@@ -42,10 +107,10 @@ def _initialize_pool():
     global _connection_pool
     if _connection_pool is None:
         try:
-            _connection_pool = pooling.MySQLConnectionPool(**POOL_CONFIG)
+            _connection_pool = pooling.MySQLConnectionPool(**_pool_config())
             logger.info("MySQL connection pool initialized successfully")
         except Error as e:
-            logger.error(f"Error initializing connection pool: {e}")
+            logger.error("Error initializing connection pool: %s", e)
             raise
 
 def get_connection():
@@ -66,7 +131,7 @@ def get_connection():
         logger.debug("Database connection acquired from pool")
         return connection
     except Error as e:
-        logger.error(f"Error getting database connection: {e}")
+        logger.error("Error getting database connection: %s", e)
         raise
 
 @contextmanager
@@ -85,73 +150,131 @@ def get_db_connection():
     except Error as e:
         if connection:
             connection.rollback()
-        logger.error(f"Database operation failed: {e}")
+        logger.error("Database operation failed: %s", e)
         raise
     finally:
-        if connection and connection.is_connected():
-            connection.close()
-            logger.debug("Database connection returned to pool")
+        # Closing a pooled connection hands it back to the pool without pinging
+        # the server; pool_reset_session resets its state on the next checkout
+        if connection is not None:
+            try:
+                connection.close()
+                logger.debug("Database connection returned to pool")
+            except Error as e:
+                logger.warning("Error returning connection to pool: %s", e)
 
-def fetch_notices(filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def _fulltext_query(search: str) -> Tuple[Optional[str], bool]:
     """
-    Fetch notices from the database with optional filtering.
+    Turn free-text search input into a boolean-mode FULLTEXT query.
+    
+    Each indexed word becomes a required prefix match (+word*), so a notice
+    must contain every word, and partial words still match the way the old
+    LIKE search did. Words the index skips (too short, or stopwords) are left
+    out of the query. Operators typed by the user are dropped.
     
     Args:
-        filters (dict, optional): Dictionary of filters to apply
-            - category: Filter by category
-            - status: Filter by status (active, inactive, expired)
-            - date_from: Filter notices from this date
-            - date_to: Filter notices until this date
-            - user_id: Filter by user who created the notice
-            - search: Search in title and content
-            - limit: Maximum number of results
-            - offset: Number of results to skip
+        search (str): Search text entered by the user
     
     Returns:
-        List[Dict[str, Any]]: List of notice dictionaries
+        Tuple[Optional[str], bool]: Boolean-mode query, or None if no word is
+            in the index; and whether the query covers every word of the search
     """
-    query = """
-        SELECT n.id, n.title, n.content, n.category, n.status, n.priority,
-               n.created_at, n.updated_at, n.expires_at, n.user_id,
-               u.username, u.email
-        FROM notices n
-        LEFT JOIN users u ON n.user_id = u.id
-        WHERE 1=1
+    words = re.findall(r"\w+", search)
+    indexed = [
+        word for word in words
+        if len(word) >= FULLTEXT_MIN_TOKEN_SIZE and word.lower() not in FULLTEXT_STOPWORDS
+    ]
+    query = " ".join(f"+{word}*" for word in indexed) or None
+    return query, query is not None and len(indexed) == len(words)
+
+def _build_notice_filters(filters: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, ...], List[Any]]:
     """
+    Build the WHERE conditions shared by notice list queries.
+    
+    Args:
+        filters (dict, optional): Filters as accepted by fetch_notices
     
+    Returns:
+        Tuple[Tuple[str, ...], List[Any]]: SQL conditions to AND together,
+            and their query parameters
+    """
+    conditions = []
     params = []
     
     if filters:
         if 'category' in filters:
-            query += " AND n.category = %s"
+            conditions.append(" AND n.category = %s")
             params.append(filters['category'])
         
+        if 'priority' in filters:
+            conditions.append(" AND n.priority = %s")
+            params.append(filters['priority'])
+        
         if 'status' in filters:
-            query += " AND n.status = %s"
+            conditions.append(" AND n.status = %s")
             params.append(filters['status'])
         
         if 'date_from' in filters:
-            query += " AND n.created_at >= %s"
+            conditions.append(" AND n.created_at >= %s")
             params.append(filters['date_from'])
         
         if 'date_to' in filters:
-            query += " AND n.created_at <= %s"
+            conditions.append(" AND n.created_at <= %s")
             params.append(filters['date_to'])
         
         if 'user_id' in filters:
-            query += " AND n.user_id = %s"
+            conditions.append(" AND n.user_id = %s")
             params.append(filters['user_id'])
         
         if 'search' in filters:
-            query += " AND (n.title LIKE %s OR n.content LIKE %s)"
-            search_term = f"%{filters['search']}%"
-            params.extend([search_term, search_term])
+            fulltext_query, fully_indexed = _fulltext_query(filters['search'])
+            if fulltext_query:
+                conditions.append(" AND MATCH(n.title, n.content) AGAINST (%s IN BOOLEAN MODE)")
+                params.append(fulltext_query)
+            if not fully_indexed:
+                # Short words and stopwords are not indexed, so also match
+                # the search text directly
+                conditions.append(" AND (n.title LIKE %s OR n.content LIKE %s)")
+                search_term = f"%{filters['search']}%"
+                params.extend([search_term, search_term])
+    
+    return tuple(conditions), params
+
+def fetch_notices(filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch notices from the database with optional filtering.
     
-    query += " ORDER BY n.created_at DESC"
+    Args:
+        filters (dict, optional): Dictionary of filters to apply
+            - category: Filter by category
+            - priority: Filter by priority (low, medium, high)
+            - status: Filter by status (active, inactive, expired)
+            - date_from: Filter notices from this date
+            - date_to: Filter notices until this date
+            - user_id: Filter by user who created the notice
+            - search: Search in title and content
+            - limit: Maximum number of results (default: DEFAULT_LIMIT)
+            - offset: Number of results to skip
     
-    if filters and 'limit' in filters:
-        query += " LIMIT %s"
-        params.append(filters['limit'])
+    Returns:
+        List[Dict[str, Any]]: List of notice dictionaries, with created_at and
+            updated_at formatted as 'YYYY-MM-DD HH:MM' strings for display.
+            Instead of the full content, each notice carries a preview of its
+            first PREVIEW_LENGTH characters and the full content_len; use
+            get_notice_by_id for the complete text.
+    """
+    if not filters:
+        # Dashboard first load: no filters, so the SQL text is fixed
+        query = _FETCH_ALL_QUERY
+        params = [PREVIEW_LENGTH, DEFAULT_LIMIT]
+    else:
+        conditions, params = _build_notice_filters(filters)
+        params.insert(0, PREVIEW_LENGTH)
+        
+        # Always bound the result set so a broad filter cannot load the whole table
+        params.append(filters.get('limit', DEFAULT_LIMIT))
+        
+        query = _NOTICE_LIST_SELECT + "".join(conditions)
+        query += " ORDER BY n.created_at DESC LIMIT %s"
         
         if 'offset' in filters:
             query += " OFFSET %s"
@@ -164,11 +287,38 @@ def fetch_notices(filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, An
             notices = cursor.fetchall()
             cursor.close()
             
-            logger.info(f"Fetched {len(notices)} notices from database")
+            logger.info("Fetched %d notices from database", len(notices))
             return notices
             
     except Error as e:
-        logger.error(f"Error fetching notices: {e}")
+        logger.error("Error fetching notices: %s", e)
+        raise
+
+def count_notices(filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Count notices matching the given filters.
+    
+    Args:
+        filters (dict, optional): Filters as accepted by fetch_notices;
+            limit and offset are ignored
+    
+    Returns:
+        int: Number of matching notices
+    """
+    conditions, params = _build_notice_filters(filters)
+    query = "SELECT COUNT(*) FROM notices n WHERE 1=1" + "".join(conditions)
+    
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            total = cursor.fetchone()[0]
+            cursor.close()
+            
+            return total
+            
+    except Error as e:
+        logger.error("Error counting notices: %s", e)
         raise
 
 def insert_notice(notice_data: Dict[str, Any]) -> int:
@@ -216,11 +366,11 @@ def insert_notice(notice_data: Dict[str, Any]) -> int:
             connection.commit()
             cursor.close()
             
-            logger.info(f"Inserted notice with ID: {notice_id}")
+            logger.info("Inserted notice with ID: %s", notice_id)
             return notice_id
             
     except Error as e:
-        logger.error(f"Error inserting notice: {e}")
+        logger.error("Error inserting notice: %s", e)
         raise
 
 def update_notice(notice_id: int, update_data: Dict[str, Any]) -> bool:
@@ -272,11 +422,11 @@ def update_notice(notice_id: int, update_data: Dict[str, Any]) -> bool:
             cursor.close()
             
             success = rows_affected > 0
-            logger.info(f"Updated notice {notice_id}: {success}")
+            logger.info("Updated notice %s: %s", notice_id, success)
             return success
             
     except Error as e:
-        logger.error(f"Error updating notice {notice_id}: {e}")
+        logger.error("Error updating notice %s: %s", notice_id, e)
         raise
 
 def delete_notice(notice_id: int) -> bool:
@@ -300,46 +450,46 @@ def delete_notice(notice_id: int) -> bool:
             cursor.close()
             
             success = rows_affected > 0
-            logger.info(f"Deleted notice {notice_id}: {success}")
+            logger.info("Deleted notice %s: %s", notice_id, success)
             return success
             
     except Error as e:
-        logger.error(f"Error deleting notice {notice_id}: {e}")
+        logger.error("Error deleting notice %s: %s", notice_id, e)
         raise
 
-def verify_user(username: str, password: str) -> Optional[Dict[str, Any]]:
+def fetch_active_users(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
     """
-    Verify user credentials and return user information.
+    Fetch several active users, including their password hashes, in one query.
     
     Args:
-        username (str): Username to verify
-        password (str): Password to verify (should be hashed)
+        usernames (list): Usernames to look up
     
     Returns:
-        dict or None: User information if credentials are valid, None otherwise
+        dict: User information keyed by casefolded username, since the users
+            table's collation matches usernames case-insensitively; unknown or
+            inactive users are absent
     """
-    query = """
-        SELECT id, username, email, role, created_at, last_login
+    if not usernames:
+        return {}
+    
+    placeholders = ", ".join(["%s"] * len(usernames))
+    query = f"""
+        SELECT id, username, email, role, password, created_at, last_login
         FROM users
-        WHERE username = %s AND password = %s AND status = 'active'
+        WHERE username IN ({placeholders}) AND status = 'active'
     """
     
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(dictionary=True)
-            cursor.execute(query, (username, password))
-            user = cursor.fetchone()
+            cursor.execute(query, tuple(usernames))
+            users = cursor.fetchall()
             cursor.close()
             
-            if user:
-                logger.info(f"User {username} verified successfully")
-                return user
-            else:
-                logger.warning(f"Failed verification for user {username}")
-                return None
-                
+            return {user['username'].casefold(): user for user in users}
+            
     except Error as e:
-        logger.error(f"Error verifying user {username}: {e}")
+        logger.error("Error fetching users: %s", e)
         raise
 
 def initialize_database():
@@ -356,7 +506,8 @@ def initialize_database():
             role ENUM('admin', 'user') DEFAULT 'user',
             status ENUM('active', 'inactive') DEFAULT 'active',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP NULL
+            last_login TIMESTAMP NULL,
+            INDEX idx_username_status (username, status)
         )
     """
     
@@ -375,7 +526,9 @@ def initialize_database():
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
             INDEX idx_category (category),
             INDEX idx_status (status),
-            INDEX idx_created_at (created_at)
+            INDEX idx_created_at (created_at),
+            INDEX idx_notices_status_cat_prio_created (status, category, priority, created_at DESC),
+            FULLTEXT ft_notice (title, content)
         )
     """
     
@@ -391,11 +544,24 @@ def initialize_database():
             cursor.execute(create_notices_table)
             logger.info("Notices table created/verified")
             
+            # Add indexes missing from tables created by older versions
+            cursor.execute("""
+                SELECT DISTINCT table_name, index_name
+                FROM information_schema.statistics
+                WHERE table_schema = DATABASE()
+            """)
+            existing_indexes = {(table, index) for table, index in cursor.fetchall()}
+            
+            for table, index, ddl in INDEX_MIGRATIONS:
+                if (table, index) not in existing_indexes:
+                    cursor.execute(ddl)
+                    logger.info("Added index %s on %s", index, table)
+            
             connection.commit()
             cursor.close()
             
     except Error as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
         raise
 
 def get_notice_statistics() -> Dict[str, Any]:
@@ -409,57 +575,48 @@ def get_notice_statistics() -> Dict[str, Any]:
         with get_db_connection() as connection:
             cursor = connection.cursor(dictionary=True)
             
-            # Get total notice count
-            cursor.execute("SELECT COUNT(*) as total FROM notices")
-            total_notices = cursor.fetchone()['total']
-            
-            # Get count by category
+            # Fetch every bucket in one round-trip, tagged by kind
             cursor.execute("""
-                SELECT category, COUNT(*) as count 
-                FROM notices 
-                GROUP BY category 
-                ORDER BY count DESC
+                SELECT 'category' AS kind, category AS bucket, COUNT(*) AS count, NULL AS recent
+                FROM notices GROUP BY category
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*), NULL
+                FROM notices GROUP BY priority
+                UNION ALL
+                SELECT 'status', status, COUNT(*), NULL
+                FROM notices GROUP BY status
+                UNION ALL
+                SELECT 'total', NULL, COUNT(*),
+                       COUNT(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN 1 END)
+                FROM notices
             """)
-            by_category = cursor.fetchall()
-            
-            # Get count by priority
-            cursor.execute("""
-                SELECT priority, COUNT(*) as count 
-                FROM notices 
-                GROUP BY priority 
-                ORDER BY FIELD(priority, 'high', 'medium', 'low')
-            """)
-            by_priority = cursor.fetchall()
-            
-            # Get count by status
-            cursor.execute("""
-                SELECT status, COUNT(*) as count 
-                FROM notices 
-                GROUP BY status 
-                ORDER BY count DESC
-            """)
-            by_status = cursor.fetchall()
+            rows = cursor.fetchall()
+            cursor.close()
             
-            # Get recent notices count (last 30 days)
-            cursor.execute("""
-                SELECT COUNT(*) as recent_count 
-                FROM notices 
-                WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """)
-            recent_notices = cursor.fetchone()['recent_count']
+            buckets = {'category': [], 'priority': [], 'status': []}
+            total_notices = recent_notices = 0
+            for row in rows:
+                if row['kind'] in buckets:
+                    buckets[row['kind']].append({row['kind']: row['bucket'], 'count': row['count']})
+                else:
+                    total_notices = row['count']
+                    recent_notices = row['recent']
             
-            cursor.close()
+            priority_order = {'high': 0, 'medium': 1, 'low': 2}
+            buckets['category'].sort(key=lambda item: item['count'], reverse=True)
+            buckets['priority'].sort(key=lambda item: priority_order.get(item['priority'], 3))
+            buckets['status'].sort(key=lambda item: item['count'], reverse=True)
             
             return {
                 'total_notices': total_notices,
-                'by_category': by_category,
-                'by_priority': by_priority,
-                'by_status': by_status,
+                'by_category': buckets['category'],
+                'by_priority': buckets['priority'],
+                'by_status': buckets['status'],
                 'recent_notices': recent_notices
             }
             
     except Error as e:
-        logger.error(f"Error getting notice statistics: {e}")
+        logger.error("Error getting notice statistics: %s", e)
         raise
 
 def get_notice_by_id(notice_id: int) -> Optional[Dict[str, Any]]:
@@ -489,14 +646,14 @@ def get_notice_by_id(notice_id: int) -> Optional[Dict[str, Any]]:
             cursor.close()
             
             if notice:
-                logger.info(f"Retrieved notice with ID: {notice_id}")
+                logger.info("Retrieved notice with ID: %s", notice_id)
                 return notice
             else:
-                logger.warning(f"Notice with ID {notice_id} not found")
+                logger.warning("Notice with ID %s not found", notice_id)
                 return None
                 
     except Error as e:
-        logger.error(f"Error retrieving notice {notice_id}: {e}")
+        logger.error("Error retrieving notice %s: %s", notice_id, e)
         raise
 
 def close_connection_pool():
@@ -518,6 +675,8 @@ def check_database_health() -> Dict[str, Any]:
     Returns:
         dict: Health status information
     """
+    config = _db_config()
+    
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor()
@@ -527,16 +686,16 @@ def check_database_health() -> Dict[str, Any]:
             
             return {
                 'status': 'healthy',
-                'database': DB_CONFIG['database'],
-                'host': DB_CONFIG['host'],
-                'port': DB_CONFIG['port']
+                'database': config['database'],
+                'host': config['host'],
+                'port': config['port']
             }
             
     except Error as e:
         return {
             'status': 'unhealthy',
             'error': str(e),
-            'database': DB_CONFIG['database'],
-            'host': DB_CONFIG['host'],
-            'port': DB_CONFIG['port']
+            'database': config['database'],
+            'host': config['host'],
+            'port': config['port']
         }
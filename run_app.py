@@ -2,9 +2,9 @@
 Startup script to run the Streamlit Notice Board application.
 """
 
-import subprocess
 import sys
 import os
+from streamlit.web import cli as stcli
 
 def run_streamlit_app():
     """Run the Streamlit application."""
@@ -16,16 +16,15 @@ def run_streamlit_app():
     app_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(app_dir)
     
-    # Run the Streamlit app
+    # Run the Streamlit app in this process rather than a second interpreter
+    sys.argv = [
+        "streamlit", "run", "app.py",
+        "--server.port=8501",
+        "--server.address=localhost"
+    ]
+    
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "app.py",
-            "--server.port=8501",
-            "--server.address=localhost"
-        ], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running Streamlit app: {e}")
-        sys.exit(1)
+        stcli.main()
     except KeyboardInterrupt:
         print("\nApplication stopped by user.")
         sys.exit(0)
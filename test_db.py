@@ -0,0 +1,66 @@
+"""
+Test script to validate the notice search query building in db.py.
+"""
+
+import sys
+from pathlib import Path
+
+_HERE = str(Path(__file__).resolve().parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+import db
+
+# Result prefix for the report
+_PASS = "✅ PASS: "
+
+_MATCH = " AND MATCH(n.title, n.content) AGAINST (%s IN BOOLEAN MODE)"
+_LIKE = " AND (n.title LIKE %s OR n.content LIKE %s)"
+
+def test_fulltext_query():
+    """Test turning search text into a boolean-mode FULLTEXT query."""
+    
+    # Every indexed word is a required prefix match
+    assert db._fulltext_query("exam schedule") == ("+exam* +schedule*", True)
+    
+    # Short words and stopwords are left out, and the query is marked partial
+    assert db._fulltext_query("IT exam") == ("+exam*", False)
+    assert db._fulltext_query("the exam") == ("+exam*", False)
+    assert db._fulltext_query("meeting For staff") == ("+meeting* +staff*", False)
+    
+    # Nothing indexable, or nothing but operators
+    assert db._fulltext_query("it") == (None, False)
+    assert db._fulltext_query("the") == (None, False)
+    assert db._fulltext_query("+-*") == (None, False)
+    
+    print(f"{_PASS}search text becomes the expected FULLTEXT query")
+
+def test_build_notice_filters():
+    """Test the WHERE conditions and parameters built for notice filters."""
+    
+    assert db._build_notice_filters(None) == ((), [])
+    
+    conditions, params = db._build_notice_filters({'category': "Academic", 'status': "active"})
+    assert conditions == (" AND n.category = %s", " AND n.status = %s")
+    assert params == ["Academic", "active"]
+    
+    # Fully indexed search uses only the FULLTEXT index
+    conditions, params = db._build_notice_filters({'search': "exam schedule"})
+    assert conditions == (_MATCH,)
+    assert params == ["+exam* +schedule*"]
+    
+    # Partially indexed search also requires the text itself
+    conditions, params = db._build_notice_filters({'search': "the exam"})
+    assert conditions == (_MATCH, _LIKE)
+    assert params == ["+exam*", "%the exam%", "%the exam%"]
+    
+    # Nothing indexable falls back to LIKE alone
+    conditions, params = db._build_notice_filters({'search': "IT"})
+    assert conditions == (_LIKE,)
+    assert params == ["%IT%", "%IT%"]
+    
+    print(f"{_PASS}notice filters build the expected conditions")
+
+if __name__ == "__main__":
+    test_fulltext_query()
+    test_build_notice_filters()
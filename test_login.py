@@ -3,19 +3,28 @@ Test script to validate the login functionality works correctly.
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import hashlib
+import types
+from collections import namedtuple
+from pathlib import Path
+
+_HERE = str(Path(__file__).resolve().parent)
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+# Dict-backed stand-in for Streamlit so auth imports without starting it
+_streamlit = types.SimpleNamespace(session_state={})
+sys.modules['streamlit'] = _streamlit
 
 import auth
 
-def test_login_functionality():
-    """Test the login functionality with various scenarios."""
-    
-    print("Testing Login Functionality")
-    print("=" * 40)
-    
-    # Test cases
-    test_cases = [
+# A login scenario, with its "Testing: ..." line formatted once up front
+Case = namedtuple('Case', 'username password success role banner')
+
+# Test cases
+_TEST_CASES = tuple(
+    Case(username, password, success, role, f"\nTesting: username='{username}', password='{password}'")
+    for username, password, success, role in [
         ("admin", "admin123", True, "admin"),
         ("user", "user123", True, "user"),
         ("john_doe", "password123", True, "user"),
@@ -25,36 +34,95 @@ def test_login_functionality():
         ("", "password", False, None),
         ("username", "", False, None),
     ]
+)
+
+# Result prefixes for the report
+_PASS = "✅ PASS: "
+_FAIL = "❌ FAIL: "
+
+def _describe(case: Case, result, passed: bool) -> str:
+    """Describe the outcome of one case for the report."""
+    if case.success:
+        return f"Login successful, role = {result}" if passed else f"Expected role {case.role}, got {result}"
+    return "Login correctly rejected" if passed else f"Expected login rejection, but got role {result}"
+
+def test_login_functionality():
+    """Test the login functionality with various scenarios."""
     
-    for username, password, expected_success, expected_role in test_cases:
-        print(f"\nTesting: username='{username}', password='{password}'")
-        
-        # Reset any previous session state
-        import streamlit as st
-        if hasattr(st, 'session_state'):
-            for key in ['logged_in', 'username', 'role', 'user_id', 'email']:
-                if key in st.session_state:
-                    del st.session_state[key]
-        
-        # Initialize session state
-        auth.initialize_session_state()
-        
-        # Test login
-        result = auth.login(username, password)
+    out = ["Testing Login Functionality", "=" * 40]
+    
+    # Authenticate every case in a single batch
+    results = auth.login_many([(case.username, case.password) for case in _TEST_CASES])
+    
+    n_pass = n_fail = 0
+    for case, result in zip(_TEST_CASES, results):
+        out.append(case.banner)
         
-        if expected_success:
-            if result == expected_role:
-                print(f"✅ PASS: Login successful, role = {result}")
-            else:
-                print(f"❌ FAIL: Expected role {expected_role}, got {result}")
-        else:
-            if result is None:
-                print(f"✅ PASS: Login correctly rejected")
-            else:
-                print(f"❌ FAIL: Expected login rejection, but got role {result}")
-    
-    print("\n" + "=" * 40)
-    print("Test completed!")
+        passed = (result == case.role) if case.success else (result is None)
+        n_pass += passed
+        n_fail += not passed
+        out.append((_PASS if passed else _FAIL) + _describe(case, result, passed))
+    
+    out.append("\n" + "=" * 40)
+    out.append(f"Test completed! {n_pass} passed, {n_fail} failed")
+    
+    # Emit the whole report in one write
+    sys.stdout.write("\n".join(out) + "\n")
+    
+    assert n_fail == 0, f"{n_fail} login case(s) failed"
+
+def test_login_session_state():
+    """Test that auth.login records the user in session state."""
+    
+    _streamlit.session_state.clear()
+    assert auth.login("admin", "admin123") == "admin"
+    state = auth.get_auth_state()
+    assert state.logged_in and state.username == "admin" and state.role == "admin"
+    
+    _streamlit.session_state.clear()
+    assert auth.login("admin", "wrong_password") is None
+    assert not auth.get_auth_state().logged_in
+    
+    print(f"{_PASS}login stores the authenticated user in session state")
+
+def test_database_username_case():
+    """Test that database users are matched regardless of username case."""
+    
+    db_users = {
+        'alice': {
+            'id': 10, 'username': 'alice', 'email': '', 'role': 'user',
+            'password': auth.hash_password("alice_pw")
+        }
+    }
+    for username in ("alice", "ALICE"):
+        user_info = auth._authenticate(username, "alice_pw", db_users)
+        assert user_info is not None and user_info['role'] == "user"
+        assert 'password' not in user_info
+    
+    print(f"{_PASS}database usernames match case-insensitively")
+
+def test_password_hashing():
+    """Test stored password hashes: PBKDF2 round-trip and legacy SHA-256 hex."""
+    
+    stored = auth.hash_password("s3cret")
+    assert stored.startswith(auth.PASSWORD_HASH_SCHEME + "$")
+    assert stored != auth.hash_password("s3cret"), "hashes should be salted"
+    assert auth.check_password("s3cret", stored)
+    assert auth.check_password("s3cret", stored), "cached check should still pass"
+    assert not auth.check_password("wrong", stored)
+    
+    legacy = hashlib.sha256(b"s3cret").hexdigest()
+    assert auth.check_password("s3cret", legacy)
+    assert not auth.check_password("wrong", legacy)
+    
+    # Malformed or non-ASCII stored values are rejected rather than raising
+    assert not auth.check_password("s3cret", auth.PASSWORD_HASH_SCHEME + "$zz")
+    assert not auth.check_password("s3cret", "pässwörd")
+    
+    print(f"{_PASS}password hashes verify and reject as expected")
 
 if __name__ == "__main__":
     test_login_functionality()
+    test_login_session_state()
+    test_database_username_case()
+    test_password_hashing()